@@ -1,6 +1,9 @@
+import logging
 import requests
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 db_tables = [
     "ps", "pscomppars", "toi", "ml", "stellarhosts", "keplernames", "k2names",
     "k2pandc", "spectra", "ukirttimeseries", "kelttimeseries",
@@ -13,6 +16,8 @@ db_tables = [
 ]
 
 base_url = "https://exoplanetarchive.ipac.caltech.edu/TAP/sync?"
+# Seconds to wait on the TAP service before giving up on a query
+request_timeout = 30
 required_param = "query="
 params = [
     "select=",  # Specifies which columns within the chosen table to return. Columns must use a valid column name.
@@ -130,7 +135,8 @@ def get_exoplanet(table: str,
                   ra: Optional[float] = None,
                   dec: Optional[float] = None,
                   radius: Optional[float] = None,
-                  format: Optional[str] = None) -> str | None:
+                  format: Optional[str] = None,
+                  timeout: Optional[float] = request_timeout) -> str | None:
     # Build SQL query for TAP service
     query = f"select {select or '*'} from {table}"
     if where:
@@ -146,23 +152,25 @@ def get_exoplanet(table: str,
     if format:
         url += f"&format={format}"
 
-    print(f"DEBUG: SQL Query: {query}")
-    print(f"DEBUG: Making request to: {url}")
-    response = requests.get(url)
-    print(f"DEBUG: Response status: {response.status_code}")
-    print(f"DEBUG: Response headers: {response.headers}")
-    print(f"DEBUG: Response content (first 200 chars): {response.text[:200]}")
+    logger.debug("SQL Query: %s", query)
+    logger.debug("Making request to: %s", url)
+    response = requests.get(url, timeout=timeout)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Response status: %s", response.status_code)
+        logger.debug("Response headers: %s", response.headers)
+        logger.debug("Response content (first 200 chars): %s",
+                     response.text[:200])
 
     if response.status_code == 200:
         if format and format.lower() == "json":
             try:
                 return response.json()
             except ValueError as e:
-                print(f"DEBUG: JSON parsing failed: {e}")
+                logger.warning("JSON parsing failed: %s", e)
                 return None
         else:
             # Return raw text for other formats
             return response.text
     else:
-        print(f"DEBUG: Request failed with status {response.status_code}")
+        logger.warning("Request failed with status %s", response.status_code)
         return None
@@ -6,6 +6,9 @@ from datetime import datetime
 # ISS NORAD catalog ID
 ISS_ID = 25544
 
+# (connect, read) seconds to wait on wheretheiss.at before giving up
+REQUEST_TIMEOUT = (5, 15)
+
 def satellites() -> List[Dict[str, Any]]:
     """
     This endpoint returns a list of satellites that this API has information about, 
@@ -14,7 +17,7 @@ def satellites() -> List[Dict[str, Any]]:
     """
     base_url = "https://api.wheretheiss.at/v1/satellites"
     try:
-        response = requests.get(base_url)
+        response = requests.get(base_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -42,7 +45,7 @@ def get_iss_position(units: Optional[str] = "kilometers",
         params['timestamps'] = str(timestamps).lower()
     
     try:
-        response = requests.get(base_url, params=params)
+        response = requests.get(base_url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -74,7 +77,7 @@ def get_iss_positions(timestamps: List[int],
         params['units'] = units
     
     try:
-        response = requests.get(base_url, params=params)
+        response = requests.get(base_url, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -92,7 +95,7 @@ def get_iss_tle() -> Optional[Dict[str, Any]]:
     base_url = f"https://api.wheretheiss.at/v1/satellites/{ISS_ID}/tles"
     
     try:
-        response = requests.get(base_url)
+        response = requests.get(base_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -114,7 +117,7 @@ def get_coordinates_info(latitude: float, longitude: float) -> Optional[Dict[str
     base_url = f"https://api.wheretheiss.at/v1/coordinates/{latitude},{longitude}"
     
     try:
-        response = requests.get(base_url)
+        response = requests.get(base_url, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
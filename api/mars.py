@@ -12,6 +12,25 @@ if os.environ.get('mars_api'):
 else:
   NASA_API_KEY = 'DEMO_KEY'
 
+# (connect, read) seconds for _session calls that do not pass a timeout
+REQUEST_TIMEOUT = (5, 30)
+
+
+class _TimeoutHTTPAdapter(requests.adapters.HTTPAdapter):
+  """HTTPAdapter that applies REQUEST_TIMEOUT when a call sets none"""
+
+  def send(self, request, timeout=None, **kwargs):
+    if timeout is None:
+      timeout = REQUEST_TIMEOUT
+    return super().send(request, timeout=timeout, **kwargs)
+
+
+# Shared session so repeated calls reuse pooled keep-alive connections
+_session = requests.Session()
+_session.mount("https://",
+               _TimeoutHTTPAdapter(pool_connections=20, pool_maxsize=50))
+_session.mount("http://", _TimeoutHTTPAdapter())
+
 
 def apod(
     date: Optional[str] = None,
@@ -48,7 +67,7 @@ def apod(
     params["thumbs"] = "true"
 
   try:
-    response = requests.get(base_url, params=params)
+    response = _session.get(base_url, params=params)
     response.raise_for_status()
     return response.json()
   except requests.RequestException as e:
@@ -81,7 +100,7 @@ class Neow:
                             timedelta(days=7)).strftime("%Y-%m-%d")
 
     try:
-      response = requests.get(f"{self.base_url}/feed", params=params)
+      response = _session.get(f"{self.base_url}/feed", params=params)
       response.raise_for_status()
       return response.json()
     except requests.RequestException as e:
@@ -96,7 +115,7 @@ class Neow:
     params = {"api_key": self.api_key}
 
     try:
-      response = requests.get(f"{self.base_url}/neo/{asteroid_id}",
+      response = _session.get(f"{self.base_url}/neo/{asteroid_id}",
                               params=params)
       response.raise_for_status()
       return response.json()
@@ -109,7 +128,7 @@ class Neow:
     params = {"api_key": self.api_key}
 
     try:
-      response = requests.get(f"{self.base_url}/neo/browse", params=params)
+      response = _session.get(f"{self.base_url}/neo/browse", params=params)
       response.raise_for_status()
       return response.json()
     except requests.RequestException as e:
@@ -141,7 +160,7 @@ class NasaAPI:
       params.setdefault("endDate", self.end_date)
 
     try:
-      response = requests.get(url, params=params)
+      response = _session.get(url, params=params)
       response.raise_for_status()
       return response.json()
     except requests.RequestException as e:
@@ -216,7 +235,7 @@ class Eonet:
   def _get(self, endpoint: str, **params) -> Optional[Dict]:
     """Internal helper for GET requests."""
     try:
-      response = requests.get(f"{self.BASE_URL}/{endpoint}", params=params)
+      response = _session.get(f"{self.BASE_URL}/{endpoint}", params=params)
       response.raise_for_status()
       return response.json()
     except requests.RequestException as e:
@@ -354,7 +373,7 @@ class NasaImages:
   def _get(self, endpoint: str, **params) -> Optional[Dict]:
     """Internal helper for GET requests."""
     try:
-      response = requests.get(f"{self.BASE_URL}/{endpoint}", params=params)
+      response = _session.get(f"{self.BASE_URL}/{endpoint}", params=params)
       response.raise_for_status()
       return response.json()
     except requests.RequestException as e:
@@ -1,40 +1,116 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Path, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List, Dict, Any, Union, Tuple
+from fastapi.responses import JSONResponse
+from typing import Optional, List, Dict, Any, Union, Tuple, Literal
 import sys
-import os
 import re
+import asyncio
 import json
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from dataclasses import asdict, dataclass
 import difflib
+import hashlib
+import heapq
+import atexit
 import logging
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+import logging.handlers
+import queue
+import threading
+import time
+
+# Set up logging. Records are handed to a background listener thread so
+# request handlers never block writing to stderr.
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue,
+                                               logging.StreamHandler())
+logging.basicConfig(level=logging.INFO,
+                    handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
-# Add the parent directory to the path to import from api modules
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
-
+# The api package is resolved from the project root: run the server as
+# ``uvicorn server.server:app`` (or ``python -m server.server``) from there.
 try:
     from api.exoplanets import get_exoplanet, db_tables
     from api.iss import (get_iss_position, get_iss_tle, satellites,
                          get_coordinates_info, is_iss_overhead)
-    from api.mars import (apod, Neow, CuriosityRover, NasaImages, Epic, Donki,
-                          Eonet, OSDR, InSight)
     print("✅ All API modules imported successfully")
 except ImportError as e:
     print(f"❌ Import error: {e}")
     sys.exit(1)
 
+# api.mars is imported on first use so workers that never serve a Mars
+# endpoint do not pay for it
+_mars_mod = None
+
+
+def _mars():
+    """Return the api.mars module, importing it on first use"""
+    global _mars_mod
+    if _mars_mod is None:
+        import api.mars as _mars_mod
+    return _mars_mod
+
+
+@lru_cache(maxsize=None)
+def _mars_client(name: str):
+    """Shared api.mars client instance, created on first use"""
+    return getattr(_mars(), name)()
+
+
+# orjson is optional; fall back to the stdlib encoder when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+
+    # Defined here rather than imported because FastAPI deprecates its own
+    # ORJSONResponse and warns whenever it is used
+    class DefaultResponse(JSONResponse):
+        """JSON response encoded with orjson"""
+
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+else:
+
+    class DefaultResponse(JSONResponse):
+        """JSON response encoded with the stdlib, dataclasses included"""
+
+        def render(self, content: Any) -> bytes:
+            return json.dumps(content,
+                              ensure_ascii=False,
+                              allow_nan=False,
+                              separators=(",", ":"),
+                              default=asdict).encode("utf-8")
+
 app = FastAPI(
     title="NASA Space Data Hub API",
     description=
     "Advanced Unified API for NASA Exoplanet, ISS tracking, Mars data with intelligent NLP search",
-    version="2.0.0")
+    version="2.0.0",
+    default_response_class=DefaultResponse)
+
+# Query parameter choices, validated by FastAPI as Literal types
+UnitsT = Literal["kilometers", "miles"]
+ExoFormatT = Literal["json", "csv", "xml"]
+EventStatusT = Literal["open", "closed", "all"]
+
+
+@dataclass(slots=True)
+class IssOverheadResponse:
+    """Response body of the ISS overhead check"""
+    is_overhead: bool
+    coordinates: Dict[str, float]
+    altitude_threshold_km: Optional[float]
+    location_info: Optional[Dict[str, Any]]
 
 # Add CORS middleware
 app.add_middleware(
@@ -45,14 +121,348 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ==============================================================================
+# REQUEST COALESCING
+# ==============================================================================
+
+
+class _Flight:
+    """A single upstream fetch shared by every concurrent caller of one key"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight: Dict[str, _Flight] = {}
+_inflight_lock = threading.Lock()
+
+# Longest a caller waits on another's fetch before running its own; above the
+# upstream clients' own timeouts, so it only matters if a leader is stuck
+SINGLE_FLIGHT_WAIT = 45
+
+
+def _qhash(*parts: Any) -> str:
+    """Short stable hash of a set of query parameters"""
+    material = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.blake2b(material.encode(), digest_size=16).hexdigest()
+
+
+def single_flight(key: str, fetch, *args, **kwargs):
+    """Run fetch(*args, **kwargs) once for all concurrent callers of key"""
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        if not flight.done.wait(SINGLE_FLIGHT_WAIT):
+            logger.warning("Shared fetch for %s timed out; fetching directly",
+                           key)
+            return fetch(*args, **kwargs)
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = fetch(*args, **kwargs)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+
+
+# Shared pool for fanning out independent upstream calls within searches.
+# Sized above anyio's default of 40 worker threads, since every concurrent
+# search running in one of those can fan out into several fetches here.
+_fetch_pool = ThreadPoolExecutor(max_workers=64,
+                                 thread_name_prefix="search-fetch")
+
+# Longest a search waits on its fetches; above the upstream clients' own
+# timeouts, so it only matters if a fetch is stuck
+FETCH_TIMEOUT = 40
+
+
+def fetch_parallel(*fetches, default: Any = None) -> List[Any]:
+    """Run zero-argument fetches concurrently, returning results in order"""
+    if len(fetches) <= 1:
+        return [fetch() for fetch in fetches]
+    futures = [_fetch_pool.submit(fetch) for fetch in fetches]
+    _, pending = wait(futures, timeout=FETCH_TIMEOUT)
+
+    # Fetches still running count as failed and yield default
+    for future in pending:
+        future.cancel()
+    if pending:
+        logger.warning("%d of %d fetches timed out", len(pending),
+                       len(futures))
+    return [
+        default if future in pending else future.result()
+        for future in futures
+    ]
+
+
+# ==============================================================================
+# RESPONSE CACHE
+# ==============================================================================
+
+# Exoplanet archive tables change on the order of days
+EXOPLANET_CACHE_TTL = 3600
+
+# Bounds on the in-process cache so it cannot grow without limit. Entries
+# weigh 1 unless cached with a larger weight, as exoplanet tables are (one
+# per table cell), so large archive pulls count against the budget by their
+# size. A million cells of row dicts is on the order of 100 MB.
+CACHE_MAX_ENTRIES = 1024
+CACHE_MAX_WEIGHT = 1_000_000
+CACHE_SWEEP_INTERVAL = 300
+
+_response_cache: Dict[str, Tuple[float, Any, int]] = {}
+_cache_lock = threading.Lock()
+_cache_weight = 0
+_last_sweep = 0.0
+
+
+def get_cached_results(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None if missing or expired"""
+    with _cache_lock:
+        entry = _response_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _sweep_cache(now: float) -> None:
+    """Drop expired entries, then the soonest-expiring ones if still full"""
+    global _last_sweep, _cache_weight
+    _last_sweep = now
+
+    expired = [
+        key for key, (expires, _, _) in _response_cache.items()
+        if expires < now
+    ]
+    for key in expired:
+        _cache_weight -= _response_cache.pop(key)[2]
+
+    if (len(_response_cache) > CACHE_MAX_ENTRIES
+            or _cache_weight > CACHE_MAX_WEIGHT):
+        by_expiry = sorted(_response_cache.items(), key=lambda kv: kv[1][0])
+        for key, (_, _, weight) in by_expiry:
+            if (len(_response_cache) <= CACHE_MAX_ENTRIES
+                    and _cache_weight <= CACHE_MAX_WEIGHT):
+                break
+            del _response_cache[key]
+            _cache_weight -= weight
+
+
+def cache_results(key: str, value: Any, ttl: float, weight: int = 1) -> None:
+    """Cache value under key for ttl seconds, counting weight to the budget"""
+    global _cache_weight
+    # A value too big for the whole budget would only evict everything else
+    if weight > CACHE_MAX_WEIGHT:
+        return
+    now = time.monotonic()
+    with _cache_lock:
+        previous = _response_cache.get(key)
+        if previous is not None:
+            _cache_weight -= previous[2]
+        _response_cache[key] = (now + ttl, value, weight)
+        _cache_weight += weight
+        if (len(_response_cache) > CACHE_MAX_ENTRIES
+                or _cache_weight > CACHE_MAX_WEIGHT
+                or now - _last_sweep > CACHE_SWEEP_INTERVAL):
+            _sweep_cache(now)
+
+
+_QUOTED_RE = re.compile(r"('(?:[^']|'')*')")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _canonicalize_ep(table: str, select: Optional[str], where: Optional[str],
+                     order: Optional[str], format: Optional[str]) -> str:
+    """Canonical form of an exoplanet query, used as its cache key"""
+    # Column order only matters for tabular output formats
+    columns = [c.strip() for c in (select or "*").split(",")]
+    if (format or "").lower() == "json":
+        columns.sort()
+
+    # Collapse whitespace everywhere except inside quoted string literals
+    parts = _QUOTED_RE.split(where or "")
+    for i in range(0, len(parts), 2):
+        parts[i] = _WHITESPACE_RE.sub(" ", parts[i])
+
+    return "|".join((table, ",".join(columns), "".join(parts).strip(),
+                     " ".join((order or "").split()), format or ""))
+
+
+# Text (CSV/XML) results are counted as one cell per this many characters
+_TEXT_CHARS_PER_CELL = 16
+
+
+def _table_weight(result: Any) -> int:
+    """Approximate size of an archive result in table cells"""
+    # JSON results are lists of row dicts, so rows times selected columns
+    if isinstance(result, list):
+        width = 1
+        if result and isinstance(result[0], dict):
+            width = len(result[0])
+        return max(len(result) * width, 1)
+    return max(len(str(result)) // _TEXT_CHARS_PER_CELL, 1)
+
+
+def fetch_exoplanets(table: str,
+                     select: Optional[str] = None,
+                     where: Optional[str] = None,
+                     order: Optional[str] = None,
+                     format: Optional[str] = None):
+    """Cached, coalesced get_exoplanet call"""
+    key = _qhash("exoplanets",
+                 _canonicalize_ep(table, select, where, order, format))
+    result = get_cached_results(key)
+    if result is None:
+        result = single_flight(key,
+                               get_exoplanet,
+                               table=table,
+                               select=select,
+                               where=where,
+                               order=order,
+                               format=format)
+        if result is not None:
+            cache_results(key,
+                          result,
+                          EXOPLANET_CACHE_TTL,
+                          weight=_table_weight(result))
+    return result
+
+
+# The ISS moves ~15 km/s, so overhead checks are only reusable briefly
+ISS_OVERHEAD_TTL = 2
+LOCATION_INFO_TTL = 3600
+
+
+def valid_coordinates(latitude: float, longitude: float) -> bool:
+    """Whether a latitude/longitude pair lies on the globe"""
+    return -90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0
+
+
+def cached_iss_overhead(latitude: float,
+                        longitude: float,
+                        altitude_threshold: float = 500) -> bool:
+    """is_iss_overhead, shared for nearby coordinates for a few seconds"""
+    key = _qhash("iss_overhead", round(latitude, 1), round(longitude, 1),
+                 altitude_threshold)
+    overhead = get_cached_results(key)
+    if overhead is None:
+        overhead = is_iss_overhead(latitude, longitude, altitude_threshold)
+        cache_results(key, overhead, ISS_OVERHEAD_TTL)
+    return overhead
+
+
+def cached_coordinates_info(latitude: float,
+                            longitude: float) -> Optional[Dict[str, Any]]:
+    """get_coordinates_info, cached since it is a static reverse lookup"""
+    # The response echoes the coordinates back, so only round off noise
+    key = _qhash("coordinates_info", round(latitude, 4), round(longitude, 4))
+    info = get_cached_results(key)
+    if info is None:
+        info = get_coordinates_info(latitude, longitude)
+        if info is not None:
+            cache_results(key, info, LOCATION_INFO_TTL)
+    return info
+
+
+# APOD, DONKI, EONET and the satellite list change at most every few minutes
+FEED_CACHE_TTL = 300
+
+
+def cached_feed(name: str, fetch, *args, **kwargs):
+    """Cached, coalesced call to a slow-moving NASA feed"""
+    key = _qhash("feed", name, *args, *sorted(kwargs.items()))
+    result = get_cached_results(key)
+    if result is None:
+        result = single_flight(key, fetch, *args, **kwargs)
+        # Some fetchers report errors as an empty list rather than None, so
+        # only non-empty results are cached; a failure must not stick
+        if result:
+            cache_results(key, result, FEED_CACHE_TTL)
+    return result
+
+
 # ==============================================================================
 # SIMPLIFIED NLP AND QUERY PROCESSING
 # ==============================================================================
 
+# pyahocorasick is optional; without it synonyms are matched one by one
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Keyword tables used by the processor, built once at import. Intents are
+# checked in order and the first match wins.
+_INTENT_PATTERNS = {
+    "discovery":
+    ("discover", "found", "detect", "identify", "search for", "find"),
+    "tracking": ("position", "location", "overhead", "tracking", "orbit",
+                 "trajectory"),
+    "imagery": ("image", "photo", "picture", "visual", "camera", "snapshot"),
+    "data_analysis": ("analyze", "compare", "statistics", "data", "trends"),
+    "space_weather": ("weather", "flare", "storm", "cme", "solar activity"),
+    "mission_info": ("mission", "rover", "spacecraft", "launch", "landing"),
+    "temporal_query": ("when", "time", "date", "period", "duration"),
+    "comparison": ("compare", "versus", "difference", "similar", "like"),
+    "factual": ("what", "how", "why", "explain", "definition")
+}
+
+# One alternation per intent keeps the substring semantics of a keyword scan
+# while doing the search in C
+_INTENT_REGEXES = tuple(
+    (intent, re.compile("|".join(map(re.escape, keywords))))
+    for intent, keywords in _INTENT_PATTERNS.items())
+
+_HABITABLE_KEYWORDS = ("habitable", "goldilocks", "life", "livable",
+                       "habitation")
+
+_STAR_KEYWORDS = {
+    "sun-like": ("sun-like", "solar-type", "g-type", "solar analog"),
+    "red-dwarf": ("red dwarf", "m-dwarf", "m-type"),
+    "hot": ("hot", "massive", "o-type", "b-type")
+}
+
+_CONDITION_WORDS = ("and", "or", "but", "with", "without", "except")
+
+# Substrings every distance unit contains; queries without one skip the regex
+_DISTANCE_UNIT_HINTS = ("light", "ly", "parsec", "pc", "km", "mile", "au")
+
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=2)
+def _year_for_hour(hour: int) -> int:
+    return datetime.now().year
+
+
+def current_year() -> int:
+    """Current year, looked up at most once an hour"""
+    return _year_for_hour(int(time.time() // 3600))
+
 
 class SimplifiedNLPProcessor:
     """Advanced Natural Language Processing for space-related queries"""
 
+    __slots__ = ("entity_synonyms", "_synonym_table", "_entity_automaton",
+                 "size_categories", "_filter_table", "_filter_automaton",
+                 "temporal_pattern", "coordinate_pattern", "sol_pattern",
+                 "distance_pattern", "number_pattern", "_parse_cached")
+
     def __init__(self):
         self.entity_synonyms = {
             "celestial_bodies": {
@@ -98,6 +508,24 @@ class SimplifiedNLPProcessor:
             }
         }
 
+        # Flat (synonym, category, canonical name) table in ontology order
+        self._synonym_table = tuple(
+            (synonym, category, canonical_name)
+            for category, entity_map in self.entity_synonyms.items()
+            for canonical_name, synonyms in entity_map.items()
+            for synonym in synonyms)
+
+        # One automaton pass finds every synonym occurring in a query
+        self._entity_automaton = None
+        if ahocorasick is not None:
+            synonym_targets = defaultdict(list)
+            for synonym, category, canonical_name in self._synonym_table:
+                synonym_targets[synonym].append((category, canonical_name))
+            self._entity_automaton = ahocorasick.Automaton()
+            for synonym, targets in synonym_targets.items():
+                self._entity_automaton.add_word(synonym, tuple(targets))
+            self._entity_automaton.make_automaton()
+
         self.size_categories = {
             "earth-like": {
                 "min":
@@ -135,164 +563,217 @@ class SimplifiedNLPProcessor:
             }
         }
 
-        self.temporal_patterns = {
-            "year_range": r'\b(19|20)\d{2}[-–—to\s]+(19|20)\d{2}\b',
-            "single_year": r'\b(19|20)\d{2}\b',
-            "decade": r'\b(19|20)\d{1}0s?\b',
-            "recent": r'\b(recent|latest|new|current|now|today)\b',
-            "last_period": r'\b(last|past)\s+(week|month|year|decade)\b',
-            "since": r'\bsince\s+(19|20)\d{2}\b',
-            "after": r'\bafter\s+(19|20)\d{2}\b',
-            "before": r'\bbefore\s+(19|20)\d{2}\b'
-        }
-
-        self.coordinate_pattern = r'(-?\d{1,3}\.?\d*)\s*[,°]\s*(-?\d{1,3}\.?\d*)'
-        self.sol_pattern = r'\bsol\s*(\d+)\b'
-        self.distance_pattern = r'(\d+(?:\.\d+)?)\s*(light\s*years?|ly|parsecs?|pc|km|miles?|au)'
+        # Every filter keyword tagged with the filter it selects
+        self._filter_table = tuple(
+            chain(((keyword, ("size", category))
+                   for category, info in self.size_categories.items()
+                   for keyword in info["keywords"]),
+                  ((keyword, ("habitable", True))
+                   for keyword in _HABITABLE_KEYWORDS),
+                  ((keyword, ("star", star_type))
+                   for star_type, keywords in _STAR_KEYWORDS.items()
+                   for keyword in keywords)))
+
+        # One automaton pass finds every filter keyword occurring in a query
+        self._filter_automaton = None
+        if ahocorasick is not None:
+            keyword_tags = defaultdict(list)
+            for keyword, tag in self._filter_table:
+                keyword_tags[keyword].append(tag)
+            self._filter_automaton = ahocorasick.Automaton()
+            for keyword, tags in keyword_tags.items():
+                self._filter_automaton.add_word(keyword, tuple(tags))
+            self._filter_automaton.make_automaton()
+
+        # Patterns are compiled once here rather than looked up in the re
+        # module cache on every query. Years, year ranges, since/after years
+        # and recency words all come out of a single temporal scan.
+        self.temporal_pattern = re.compile(
+            r'\b(?:(?P<keyword>since|after)\s+)?(?P<y1>(?:19|20)\d{2})'
+            r'(?:[-–—to\s]+(?P<y2>(?:19|20)\d{2}))?\b'
+            r'|\b(?P<recent>recent|latest|new|current|now|today)\b')
+
+        self.coordinate_pattern = re.compile(
+            r'(-?\d{1,3}\.?\d*)\s*[,°]\s*(-?\d{1,3}\.?\d*)')
+        self.sol_pattern = re.compile(r'\bsol\s*(\d+)\b')
+        self.distance_pattern = re.compile(
+            r'(\d+(?:\.\d+)?)\s*(light\s*years?|ly|parsecs?|pc|km|miles?|au)')
+        self.number_pattern = re.compile(r'\b(\d+(?:\.\d+)?)\b')
+
+        # Parsing is deterministic, so repeated queries skip the regex work
+        self._parse_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(self._parse)
 
     def parse_query(self, query: str) -> Dict[str, Any]:
         """Advanced query parsing with enhanced entity recognition"""
+        # The parse is shared with every later caller of the same query, so
+        # it must be treated as read-only; copying it cost as much as parsing
+        return self._parse_cached(query, current_year())
+
+    def _parse(self, query: str, year: int) -> Dict[str, Any]:
+        """Uncached parse; year keys the cache since "recent" depends on it"""
+        # Lowercased once here and shared by every extractor
+        query_lower = query.lower()
         parsed = {
             "original": query,
-            "intent": self._classify_intent(query),
-            "entities": self._extract_entities(query),
-            "temporal": self._extract_temporal(query),
-            "spatial": self._extract_spatial(query),
-            "numerical": self._extract_numerical(query),
-            "filters": self._extract_filters(query),
-            "complexity": self._assess_complexity(query),
+            "intent": self._classify_intent(query_lower),
+            "entities": self._extract_entities(query_lower),
+            "temporal": self._extract_temporal(query_lower, year),
+            "spatial": self._extract_spatial(query, query_lower),
+            "numerical": self._extract_numerical(query, query_lower),
+            "filters": self._extract_filters(query_lower),
+            "complexity": "simple",
             "confidence": 0.0
         }
 
-        # Calculate confidence score
-        parsed["confidence"] = self._calculate_confidence(parsed, query)
+        # Both scores share these counts rather than each recomputing them
+        entity_count = sum(map(len, parsed["entities"].values()))
+        word_count = len(query.split())
+        parsed["complexity"] = self._assess_complexity(
+            parsed, query_lower, entity_count, word_count)
+        parsed["confidence"] = self._calculate_confidence(
+            parsed, entity_count, word_count)
 
         return parsed
 
-    def _classify_intent(self, query: str) -> str:
+    def _classify_intent(self, query_lower: str) -> str:
         """Classify the user's intent based on query content"""
-        query_lower = query.lower()
-
-        intent_patterns = {
-            "discovery":
-            ["discover", "found", "detect", "identify", "search for", "find"],
-            "tracking": [
-                "position", "location", "overhead", "tracking", "orbit",
-                "trajectory"
-            ],
-            "imagery":
-            ["image", "photo", "picture", "visual", "camera", "snapshot"],
-            "data_analysis":
-            ["analyze", "compare", "statistics", "data", "trends"],
-            "space_weather":
-            ["weather", "flare", "storm", "cme", "solar activity"],
-            "mission_info":
-            ["mission", "rover", "spacecraft", "launch", "landing"],
-            "temporal_query": ["when", "time", "date", "period", "duration"],
-            "comparison":
-            ["compare", "versus", "difference", "similar", "like"],
-            "factual": ["what", "how", "why", "explain", "definition"]
-        }
-
-        for intent, keywords in intent_patterns.items():
-            if any(keyword in query_lower for keyword in keywords):
+        for intent, pattern in _INTENT_REGEXES:
+            if pattern.search(query_lower):
                 return intent
 
         return "general_search"
 
-    def _extract_entities(self, query: str) -> Dict[str, List[str]]:
+    def _extract_entities(self, query_lower: str) -> Dict[str, List[str]]:
         """Extract and normalize entities using synonym matching"""
         entities = defaultdict(list)
-        query_lower = query.lower()
 
-        for category, entity_map in self.entity_synonyms.items():
-            for canonical_name, synonyms in entity_map.items():
-                for synonym in synonyms:
-                    if synonym in query_lower:
-                        if canonical_name not in entities[category]:
-                            entities[category].append(canonical_name)
+        if self._entity_automaton is not None:
+            matched = {
+                target
+                for _, targets in self._entity_automaton.iter(query_lower)
+                for target in targets
+            }
+            # Report matches in ontology order, as the scan below does
+            for category, entity_map in self.entity_synonyms.items():
+                for canonical_name in entity_map:
+                    if (category, canonical_name) in matched:
+                        entities[category].append(canonical_name)
+            return dict(entities)
+
+        # A set of seen entities keeps the lists in first-match order
+        seen = set()
+        for synonym, category, canonical_name in self._synonym_table:
+            if synonym in query_lower:
+                if (category, canonical_name) not in seen:
+                    seen.add((category, canonical_name))
+                    entities[category].append(canonical_name)
 
         return dict(entities)
 
-    def _extract_temporal(self, query: str) -> Dict[str, Any]:
+    def _extract_temporal(self, query_lower: str,
+                          year: int) -> Dict[str, Any]:
         """Enhanced temporal extraction with ranges and relative dates"""
         temporal = {}
-        query_lower = query.lower()
-
-        # Year ranges
-        year_range_match = re.search(self.temporal_patterns["year_range"],
-                                     query)
-        if year_range_match:
-            start_year = int(
-                year_range_match.group(1) + year_range_match.group(2)[:2])
-            end_year = int(
-                year_range_match.group(3) + year_range_match.group(4)[:2])
-            temporal["year_range"] = [start_year, end_year]
-
-        # Single year
-        year_match = re.search(self.temporal_patterns["single_year"], query)
-        if year_match and "year_range" not in temporal:
-            temporal["year"] = int(year_match.group())
+        first_year = year_range = since_year = after_year = None
+        recent = False
+
+        # The first match of each kind wins, as with separate searches
+        for match in self.temporal_pattern.finditer(query_lower):
+            if match.group("recent"):
+                recent = True
+                continue
+
+            matched_year = int(match.group("y1"))
+            if first_year is None:
+                first_year = matched_year
+            if year_range is None and match.group("y2"):
+                year_range = [matched_year, int(match.group("y2"))]
+            keyword = match.group("keyword")
+            if keyword == "since" and since_year is None:
+                since_year = matched_year
+            elif keyword == "after" and after_year is None:
+                after_year = matched_year
+
+        # Year ranges take precedence over a single year
+        if year_range is not None:
+            temporal["year_range"] = year_range
+        elif first_year is not None:
+            temporal["year"] = first_year
 
         # Relative time
-        if re.search(self.temporal_patterns["recent"], query_lower):
+        if recent:
             temporal["relative"] = "recent"
-            temporal["since_year"] = datetime.now().year - 2
+            temporal["since_year"] = year - 2
 
         # Since/after patterns
-        since_match = re.search(self.temporal_patterns["since"], query_lower)
-        if since_match:
-            temporal["since_year"] = int(since_match.group(1))
-
-        after_match = re.search(self.temporal_patterns["after"], query_lower)
-        if after_match:
-            temporal["after_year"] = int(after_match.group(1))
+        if since_year is not None:
+            temporal["since_year"] = since_year
+        if after_year is not None:
+            temporal["after_year"] = after_year
 
         return temporal
 
-    def _extract_spatial(self, query: str) -> Dict[str, Any]:
+    def _extract_spatial(self, query: str,
+                         query_lower: str) -> Dict[str, Any]:
         """Extract coordinates and spatial references"""
         spatial = {}
 
-        # Coordinate patterns
-        coord_match = re.search(self.coordinate_pattern, query)
-        if coord_match:
-            lat, lon = float(coord_match.group(1)), float(coord_match.group(2))
-            spatial["coordinates"] = {"latitude": lat, "longitude": lon}
+        # Coordinate patterns; a pair needs a comma or degree separator
+        if "," in query or "°" in query:
+            coord_match = self.coordinate_pattern.search(query)
+            if coord_match:
+                lat = float(coord_match.group(1))
+                lon = float(coord_match.group(2))
+                spatial["coordinates"] = {"latitude": lat, "longitude": lon}
 
         # Distance constraints
-        distance_match = re.search(self.distance_pattern, query.lower())
-        if distance_match:
-            value = float(distance_match.group(1))
-            unit = distance_match.group(2).replace(" ", "")
-            spatial["distance"] = {"value": value, "unit": unit}
+        if any(hint in query_lower for hint in _DISTANCE_UNIT_HINTS):
+            distance_match = self.distance_pattern.search(query_lower)
+            if distance_match:
+                value = float(distance_match.group(1))
+                unit = distance_match.group(2).replace(" ", "")
+                spatial["distance"] = {"value": value, "unit": unit}
 
         return spatial
 
-    def _extract_numerical(self, query: str) -> Dict[str, Any]:
+    def _extract_numerical(self, query: str,
+                           query_lower: str) -> Dict[str, Any]:
         """Extract numerical values and constraints"""
         numerical = {}
 
         # Sol numbers
-        sol_match = re.search(self.sol_pattern, query.lower())
-        if sol_match:
-            numerical["sol"] = int(sol_match.group(1))
+        if "sol" in query_lower:
+            sol_match = self.sol_pattern.search(query_lower)
+            if sol_match:
+                numerical["sol"] = int(sol_match.group(1))
 
         # General numbers that might be relevant
-        number_matches = re.findall(r'\b(\d+(?:\.\d+)?)\b', query)
+        number_matches = self.number_pattern.findall(query)
         if number_matches:
             numerical["values"] = [float(x) for x in number_matches]
 
         return numerical
 
-    def _extract_filters(self, query: str) -> Dict[str, Any]:
+    def _extract_filters(self, query_lower: str) -> Dict[str, Any]:
         """Extract search filters and constraints"""
         filters = {}
-        query_lower = query.lower()
 
-        # Size categories
+        if self._filter_automaton is not None:
+            matched = {
+                tag
+                for _, tags in self._filter_automaton.iter(query_lower)
+                for tag in tags
+            }
+        else:
+            matched = {
+                tag
+                for keyword, tag in self._filter_table
+                if keyword in query_lower
+            }
+
+        # Size categories; the first category in table order wins
         for category, info in self.size_categories.items():
-            if any(keyword in query_lower for keyword in info["keywords"]):
+            if ("size", category) in matched:
                 filters["size_category"] = category
                 filters["radius_range"] = {
                     "min": info["min"],
@@ -301,52 +782,40 @@ class SimplifiedNLPProcessor:
                 break
 
         # Habitable zone
-        habitable_keywords = [
-            "habitable", "goldilocks", "life", "livable", "habitation"
-        ]
-        if any(keyword in query_lower for keyword in habitable_keywords):
+        if ("habitable", True) in matched:
             filters["habitable_zone"] = True
 
         # Star types
-        star_keywords = {
-            "sun-like": ["sun-like", "solar-type", "g-type", "solar analog"],
-            "red-dwarf": ["red dwarf", "m-dwarf", "m-type"],
-            "hot": ["hot", "massive", "o-type", "b-type"]
-        }
-
-        for star_type, keywords in star_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
+        for star_type in _STAR_KEYWORDS:
+            if ("star", star_type) in matched:
                 filters["star_type"] = star_type
                 break
 
         return filters
 
-    def _assess_complexity(self, query: str) -> str:
+    def _assess_complexity(self, parsed: Dict[str, Any], query_lower: str,
+                           entity_count: int, word_count: int) -> str:
         """Assess query complexity based on multiple factors"""
         complexity_score = 0
 
         # Length factor
-        if len(query.split()) > 10:
+        if word_count > 10:
             complexity_score += 1
 
         # Multiple entities
-        entity_count = sum(
-            len(entities)
-            for entities in self._extract_entities(query).values())
         if entity_count > 2:
             complexity_score += 1
 
         # Temporal constraints
-        if len(self._extract_temporal(query)) > 1:
+        if len(parsed["temporal"]) > 1:
             complexity_score += 1
 
         # Multiple conditions
-        condition_words = ["and", "or", "but", "with", "without", "except"]
-        if any(word in query.lower() for word in condition_words):
+        if any(word in query_lower for word in _CONDITION_WORDS):
             complexity_score += 1
 
         # Numerical constraints
-        if len(self._extract_numerical(query)) > 1:
+        if len(parsed["numerical"]) > 1:
             complexity_score += 1
 
         if complexity_score >= 3:
@@ -357,7 +826,7 @@ class SimplifiedNLPProcessor:
             return "simple"
 
     def _calculate_confidence(self, parsed: Dict[str, Any],
-                              query: str) -> float:
+                              entity_count: int, word_count: int) -> float:
         """Calculate confidence score for query interpretation"""
         confidence = 0.5  # Base confidence
 
@@ -366,8 +835,6 @@ class SimplifiedNLPProcessor:
             confidence += 0.1
 
         # Entity recognition
-        entity_count = sum(
-            len(entities) for entities in parsed["entities"].values())
         confidence += min(entity_count * 0.1, 0.2)
 
         # Temporal specificity
@@ -379,7 +846,7 @@ class SimplifiedNLPProcessor:
             confidence += 0.1
 
         # Query structure
-        if len(query.split()) >= 3:  # Not too short
+        if word_count >= 3:  # Not too short
             confidence += 0.1
 
         return min(confidence, 1.0)
@@ -406,24 +873,52 @@ def fuzzy_match_names(query_name: str,
     return sorted(matches, key=lambda x: x[1], reverse=True)
 
 
-def calculate_relevance_score(item: Dict[str, Any], parsed_query: Dict[str,
-                                                                       Any],
-                              query: str) -> float:
+@dataclass(slots=True)
+class _ScoringContext:
+    """Per-query inputs to calculate_relevance_score, resolved once"""
+    query_words: Tuple[str, ...]
+    temporal: Dict[str, Any]
+    radius_range: Optional[Tuple[float, float]]
+    habitable_zone: bool
+    discovery: bool
+
+
+def scoring_context(parsed_query: Dict[str, Any],
+                    query: str) -> _ScoringContext:
+    """Resolve the parts of a parsed query that every item is scored against"""
+    filters = parsed_query.get("filters", {})
+    radius_range = filters.get("radius_range")
+    return _ScoringContext(
+        query_words=tuple(query.lower().split()),
+        temporal=parsed_query.get("temporal", {}),
+        radius_range=(radius_range["min"], radius_range["max"])
+        if radius_range else None,
+        habitable_zone=bool(filters.get("habitable_zone")),
+        discovery=parsed_query.get("intent", "") == "discovery")
+
+
+def calculate_relevance_score(
+        item: Dict[str, Any],
+        parsed_query: Dict[str, Any],
+        query: str,
+        context: Optional[_ScoringContext] = None) -> float:
     """Multi-factor relevance scoring"""
+    # Callers scoring many items pass a context built once per query
+    if context is None:
+        context = scoring_context(parsed_query, query)
     score = 0.0
-    query_lower = query.lower()
 
     # Name matching (highest weight)
     if "pl_name" in item and item["pl_name"]:
         name_lower = str(item["pl_name"]).lower()
-        for word in query_lower.split():
+        for word in context.query_words:
             if word in name_lower:
                 score += 0.4
 
     # Temporal relevance
     if "disc_year" in item and item["disc_year"]:
         year = item["disc_year"]
-        temporal = parsed_query.get("temporal", {})
+        temporal = context.temporal
 
         if "year" in temporal and year == temporal["year"]:
             score += 0.3
@@ -439,19 +934,16 @@ def calculate_relevance_score(item: Dict[str, Any], parsed_query: Dict[str,
     # Size relevance
     if "pl_rade" in item and item["pl_rade"]:
         radius = item["pl_rade"]
-        filters = parsed_query.get("filters", {})
 
-        if "radius_range" in filters:
-            min_r, max_r = filters["radius_range"]["min"], filters[
-                "radius_range"]["max"]
+        if context.radius_range is not None:
+            min_r, max_r = context.radius_range
             if min_r <= radius <= max_r:
                 score += 0.2
 
     # Habitable zone bonus
     if "pl_orbsmax" in item and item["pl_orbsmax"]:
         orbit = item["pl_orbsmax"]
-        if parsed_query.get("filters",
-                            {}).get("habitable_zone") and 0.7 <= orbit <= 1.5:
+        if context.habitable_zone and 0.7 <= orbit <= 1.5:
             score += 0.15
 
     # Distance relevance (closer is better for exoplanets)
@@ -463,14 +955,37 @@ def calculate_relevance_score(item: Dict[str, Any], parsed_query: Dict[str,
             score += 0.05
 
     # Intent-specific bonuses
-    intent = parsed_query.get("intent", "")
-    if intent == "discovery" and "disc_year" in item and item[
+    if context.discovery and "disc_year" in item and item[
             "disc_year"] and item["disc_year"] >= 2015:
         score += 0.1
 
     return score
 
 
+# Archive predicates for the parsed temporal keys, in order of precedence
+_TEMPORAL_CONDITIONS = (
+    ("year", "disc_year={}"),
+    ("year_range", "disc_year>={} and disc_year<={}"),
+    ("since_year", "disc_year>={}"),
+    ("after_year", "disc_year>{}"),
+)
+
+# Archive predicates for the API's advanced filters
+_ADVANCED_FILTER_CONDITIONS = (
+    ("min_distance", "sy_dist>={}"),
+    ("max_distance", "sy_dist<={}"),
+    ("min_mass", "pl_masse>={}"),
+    ("max_mass", "pl_masse<={}"),
+)
+
+# Archive predicates for the star types recognised by the parser
+_STAR_CONDITIONS = {
+    "sun-like": "st_teff>=5200 and st_teff<=6000",
+    "red-dwarf": "st_teff<4000",
+    "hot": "st_teff>8000"
+}
+
+
 def search_exoplanets_advanced(
         query: str, parsed_query: Dict[str, Any], limit: int,
         advanced_filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -478,20 +993,15 @@ def search_exoplanets_advanced(
     try:
         where_conditions = []
 
-        # Temporal filters
+        # Temporal filters, most specific first
         temporal = parsed_query.get("temporal", {})
-        if "year" in temporal:
-            where_conditions.append(f"disc_year={temporal['year']}")
-        elif "year_range" in temporal:
-            start, end = temporal["year_range"]
-            where_conditions.append(f"disc_year>={start} and disc_year<={end}")
-        elif "since_year" in temporal:
-            where_conditions.append(f"disc_year>={temporal['since_year']}")
-        elif "after_year" in temporal:
-            where_conditions.append(f"disc_year>{temporal['after_year']}")
-        elif "recent" in temporal or "since_year" in temporal:
-            since_year = temporal.get("since_year", 2020)
-            where_conditions.append(f"disc_year>={since_year}")
+        for key, template in _TEMPORAL_CONDITIONS:
+            if key in temporal:
+                value = temporal[key]
+                where_conditions.append(
+                    template.format(*value) if key ==
+                    "year_range" else template.format(value))
+                break
 
         # Size filters
         filters = parsed_query.get("filters", {})
@@ -505,13 +1015,9 @@ def search_exoplanets_advanced(
             where_conditions.append("pl_orbsmax>=0.7 and pl_orbsmax<=1.5")
 
         # Star type filters
-        star_type = filters.get("star_type")
-        if star_type == "sun-like":
-            where_conditions.append("st_teff>=5200 and st_teff<=6000")
-        elif star_type == "red-dwarf":
-            where_conditions.append("st_teff<4000")
-        elif star_type == "hot":
-            where_conditions.append("st_teff>8000")
+        star_condition = _STAR_CONDITIONS.get(filters.get("star_type"))
+        if star_condition:
+            where_conditions.append(star_condition)
 
         # Distance constraints
         spatial = parsed_query.get("spatial", {})
@@ -526,19 +1032,12 @@ def search_exoplanets_advanced(
                 ly_value = dist_value * 3.26
                 where_conditions.append(f"sy_dist<={ly_value}")
 
-        # Advanced filters from API
-        if "min_distance" in advanced_filters:
-            where_conditions.append(
-                f"sy_dist>={advanced_filters['min_distance']}")
-        if "max_distance" in advanced_filters:
-            where_conditions.append(
-                f"sy_dist<={advanced_filters['max_distance']}")
-        if "min_mass" in advanced_filters:
-            where_conditions.append(
-                f"pl_masse>={advanced_filters['min_mass']}")
-        if "max_mass" in advanced_filters:
-            where_conditions.append(
-                f"pl_masse<={advanced_filters['max_mass']}")
+        # Advanced filters from API. Values are coerced to float so nothing
+        # but a number can reach the where clause.
+        for key, template in _ADVANCED_FILTER_CONDITIONS:
+            if key in advanced_filters:
+                where_conditions.append(
+                    template.format(float(advanced_filters[key])))
 
         where_clause = " and ".join(
             where_conditions) if where_conditions else None
@@ -550,25 +1049,28 @@ def search_exoplanets_advanced(
             "pl_orbper", "pl_eqt", "sy_kepmag", "st_rad", "st_mass"
         ]
 
-        result = get_exoplanet(table="ps",
-                               select=",".join(select_columns),
-                               where=where_clause,
-                               order="disc_year desc",
-                               format="json")
+        result = fetch_exoplanets(table="ps",
+                                  select=",".join(select_columns),
+                                  where=where_clause,
+                                  order="disc_year desc",
+                                  format="json")
 
         if result and isinstance(result, list):
             # Add relevance scores
-            for item in result:
-                item["_relevance_score"] = calculate_relevance_score(
-                    item, parsed_query, query)
-
-            # Sort by relevance
-            result.sort(key=lambda x: x.get("_relevance_score", 0),
-                        reverse=True)
+            context = scoring_context(parsed_query, query)
+            scores = [
+                calculate_relevance_score(item, parsed_query, query, context)
+                for item in result
+            ]
 
-            # Limit results
-            if len(result) > limit:
-                result = result[:limit]
+            # Keep the top `limit` by relevance (stable, like a full sort)
+            # and copy only those, so the cached rows stay untouched
+            top = heapq.nlargest(limit,
+                                 range(len(result)),
+                                 key=scores.__getitem__)
+            result = [{
+                **result[i], "_relevance_score": scores[i]
+            } for i in top]
 
             return {
                 "source": "NASA Exoplanet Archive",
@@ -581,159 +1083,236 @@ def search_exoplanets_advanced(
                 "confidence": parsed_query.get("confidence", 0.8)
             }
 
-    except Exception as e:
-        print(f"Error in advanced exoplanet search: {e}")
+    except Exception:
+        logger.exception("Error in advanced exoplanet search")
 
     return None
 
 
+# Keywords that pull in each Mars/ISS data source. These are plain substring
+# matches, so "solar" still triggers the rover search through "sol".
+_SOURCE_KEYWORDS = {
+    "apod": ("picture", "image", "photo", "apod", "astronomy"),
+    "rover": ("rover", "mars", "curiosity", "perseverance", "sol"),
+    "neo": ("asteroid", "neo", "near earth"),
+    "weather": ("weather", "flare", "storm", "cme", "solar"),
+    "earth": ("earth", "epic", "observation"),
+    "events": ("event", "natural", "disaster", "fire", "volcano"),
+    "iss": ("iss", "station", "space station", "international", "orbit")
+}
+
+# Without pyahocorasick each source gets one alternation regex instead
+_SOURCE_PATTERNS = {
+    source: re.compile("|".join(map(re.escape, keywords)))
+    for source, keywords in _SOURCE_KEYWORDS.items()
+}
+
+
+def _build_source_automaton():
+    """One automaton over every source keyword, or None without ahocorasick"""
+    if ahocorasick is None:
+        return None
+    keyword_sources = defaultdict(list)
+    for source, keywords in _SOURCE_KEYWORDS.items():
+        for keyword in keywords:
+            keyword_sources[keyword].append(source)
+    automaton = ahocorasick.Automaton()
+    for keyword, sources in keyword_sources.items():
+        automaton.add_word(keyword, tuple(sources))
+    automaton.make_automaton()
+    return automaton
+
+
+_source_automaton = _build_source_automaton()
+
+
+@lru_cache(maxsize=1024)
+def match_sources(query_lower: str) -> frozenset:
+    """Data sources whose keywords appear in the lowercased query"""
+    if _source_automaton is not None:
+        return frozenset(source
+                         for _, sources in _source_automaton.iter(query_lower)
+                         for source in sources)
+    return frozenset(source for source, pattern in _SOURCE_PATTERNS.items()
+                     if pattern.search(query_lower))
+
+
+# Rovers in order of preference, and cameras that can be named directly
+_ROVERS = ("curiosity", "perseverance", "opportunity")
+_ROVER_CAMERAS = ("navcam", "mastcam")
+
+# No mission is anywhere near this many sols; larger values are never valid
+MAX_SOL = 99999
+
+
 def search_mars_comprehensive(query: str, parsed_query: Dict[str, Any],
                               limit: int) -> Optional[Dict[str, Any]]:
     """Comprehensive Mars data search across multiple sources"""
     try:
-        results = []
         query_lower = query.lower()
+        sources = match_sources(query_lower)
+        entities = parsed_query.get("entities", {})
+        numerical = parsed_query.get("numerical", {})
 
         # APOD search
-        if any(word in query_lower
-               for word in ["picture", "image", "photo", "apod", "astronomy"]):
+        def apod():
             try:
                 count = min(limit // 2, 5)
-                apod_result = apod(count=count)
+                apod_result = cached_feed("apod", _mars().apod, count=count)
                 if apod_result:
-                    results.append({
+                    return [{
                         "type": "apod",
                         "source": "NASA APOD",
                         "data": apod_result,
                         "relevance_score": 0.8
-                    })
-            except Exception as e:
-                print(f"APOD search error: {e}")
+                    }]
+            except Exception:
+                logger.exception("APOD search error")
+            return []
 
         # Mars rover photos
-        entities = parsed_query.get("entities", {})
-        numerical = parsed_query.get("numerical", {})
-
-        if any(word in query_lower for word in
-               ["rover", "mars", "curiosity", "perseverance", "sol"]):
+        def rover_photos():
             try:
                 sol = numerical.get("sol", 1000)
 
-                # Try multiple rovers
-                rovers = ["curiosity", "perseverance", "opportunity"]
-                for rover_name in rovers:
-                    if rover_name in query_lower or "rover" in query_lower:
-                        rover = CuriosityRover()
-
-                        # Determine camera type
-                        camera = None
-                        instruments = entities.get("instruments", [])
-                        if instruments:
-                            camera = instruments[0]
-                        elif "navcam" in query_lower:
-                            camera = "navcam"
-                        elif "mastcam" in query_lower:
-                            camera = "mastcam"
-
-                        photos = rover.photos_by_sol(rover_name,
-                                                     sol,
-                                                     camera=camera,
-                                                     page=1)
-                        if photos and photos.get("photos"):
-                            limited_photos = photos["photos"][:limit // 3]
-                            results.append({
-                                "type": "rover_photos",
-                                "source": f"Mars {rover_name.title()} Rover",
-                                "sol": sol,
-                                "camera": camera,
-                                "data": limited_photos,
-                                "relevance_score": 0.9
-                            })
-                        break
-            except Exception as e:
-                print(f"Rover search error: {e}")
+                # A generic "rover" query goes to the first rover listed
+                if "rover" in query_lower:
+                    rover_name = _ROVERS[0]
+                else:
+                    rover_name = next(
+                        (name for name in _ROVERS if name in query_lower),
+                        None)
+
+                # Skip the round trip for sols no rover can have
+                if rover_name is not None and sol <= MAX_SOL:
+                    # Determine camera type
+                    instruments = entities.get("instruments", [])
+                    if instruments:
+                        camera = instruments[0]
+                    else:
+                        camera = next((name for name in _ROVER_CAMERAS
+                                       if name in query_lower), None)
+
+                    rover = _mars_client("CuriosityRover")
+                    photos = rover.photos_by_sol(rover_name,
+                                                 sol,
+                                                 camera=camera,
+                                                 page=1)
+                    if photos and photos.get("photos"):
+                        limited_photos = photos["photos"][:limit // 3]
+                        return [{
+                            "type": "rover_photos",
+                            "source": f"Mars {rover_name.title()} Rover",
+                            "sol": sol,
+                            "camera": camera,
+                            "data": limited_photos,
+                            "relevance_score": 0.9
+                        }]
+            except Exception:
+                logger.exception("Rover search error")
+            return []
 
         # Near Earth Objects
-        if any(word in query_lower
-               for word in ["asteroid", "neo", "near earth"]):
+        def neo():
             try:
-                neow = Neow()
-                neo_data = neow.neo_feed()
+                neo_data = cached_feed("neo_feed",
+                                       _mars_client("Neow").neo_feed)
                 if neo_data:
-                    results.append({
+                    return [{
                         "type": "neo",
                         "source": "Near Earth Objects",
                         "data": neo_data,
                         "relevance_score": 0.7
-                    })
-            except Exception as e:
-                print(f"NEO search error: {e}")
+                    }]
+            except Exception:
+                logger.exception("NEO search error")
+            return []
 
-        # Space weather
-        if any(word in query_lower
-               for word in ["weather", "flare", "storm", "cme", "solar"]):
+        # Space weather: solar flares
+        def solar_flares():
             try:
-                donki = Donki()
-
-                # Solar flares
-                flare_data = donki.flr()
+                flare_data = cached_feed("donki_flr",
+                                         _mars_client("Donki").flr)
                 if flare_data:
-                    results.append({
+                    return [{
                         "type": "solar_flares",
                         "source": "DONKI Space Weather",
                         "data": flare_data,
                         "relevance_score": 0.8
-                    })
+                    }]
+            except Exception:
+                logger.exception("Space weather search error")
+            return []
 
-                # CME data
-                cme_data = donki.cme()
+        # Space weather: CME data
+        def cme():
+            try:
+                cme_data = cached_feed("donki_cme",
+                                       _mars_client("Donki").cme)
                 if cme_data:
-                    results.append({
+                    return [{
                         "type": "cme",
                         "source": "DONKI Space Weather",
                         "data": cme_data,
                         "relevance_score": 0.8
-                    })
-
-            except Exception as e:
-                print(f"Space weather search error: {e}")
+                    }]
+            except Exception:
+                logger.exception("Space weather search error")
+            return []
 
         # Earth observation
-        if any(word in query_lower
-               for word in ["earth", "epic", "observation"]):
+        def earth_images():
             try:
-                epic = Epic()
-                earth_images = epic.natural_latest()
-                if earth_images:
-                    results.append({
+                images = cached_feed("epic_latest",
+                                     _mars_client("Epic").natural_latest)
+                if images:
+                    return [{
                         "type": "earth_images",
                         "source": "EPIC Earth Images",
-                        "data": earth_images[:limit // 4],
+                        "data": images[:limit // 4],
                         "relevance_score": 0.7
-                    })
-            except Exception as e:
-                print(f"Earth observation search error: {e}")
+                    }]
+            except Exception:
+                logger.exception("Earth observation search error")
+            return []
 
         # Natural events
-        if any(word in query_lower for word in
-               ["event", "natural", "disaster", "fire", "volcano"]):
+        def natural_events():
             try:
-                eonet = Eonet()
-                events = eonet.events(limit=limit // 4)
+                events = cached_feed("eonet_events",
+                                     _mars_client("Eonet").events,
+                                     limit=limit // 4)
                 if events:
-                    results.append({
+                    return [{
                         "type": "natural_events",
                         "source": "EONET Natural Events",
                         "data": events,
                         "relevance_score": 0.6
-                    })
-            except Exception as e:
-                print(f"Natural events search error: {e}")
+                    }]
+            except Exception:
+                logger.exception("Natural events search error")
+            return []
+
+        # The sources are independent, so fetch them concurrently; results
+        # keep this order, which decides ties in the relevance sort
+        candidates = (
+            ("apod", apod),
+            ("rover", rover_photos),
+            ("neo", neo),
+            ("weather", solar_flares),
+            ("weather", cme),
+            ("earth", earth_images),
+            ("events", natural_events),
+        )
+        fetches = [fetch for source, fetch in candidates if source in sources]
+        results = [
+            item for items in fetch_parallel(*fetches, default=[])
+            for item in items
+        ]
 
         if results:
             # Sort by relevance
-            results.sort(key=lambda x: x.get("relevance_score", 0),
-                         reverse=True)
+            results.sort(key=itemgetter("relevance_score"), reverse=True)
 
             return {
                 "source": "Mars & NASA Multi-API",
@@ -742,8 +1321,8 @@ def search_mars_comprehensive(query: str, parsed_query: Dict[str, Any],
                 "query_interpretation": parsed_query
             }
 
-    except Exception as e:
-        print(f"Error in comprehensive Mars search: {e}")
+    except Exception:
+        logger.exception("Error in comprehensive Mars search")
 
     return None
 
@@ -754,11 +1333,37 @@ def search_iss_enhanced(query: str, parsed_query: Dict[str, Any],
     try:
         results = []
         query_lower = query.lower()
+        sources = match_sources(query_lower)
+
+        if "iss" in sources:
+            spatial = parsed_query.get("spatial", {})
+            coords = spatial.get("coordinates")
+            # Numbers that merely look like coordinates are not looked up
+            if coords and not valid_coordinates(coords["latitude"],
+                                                coords["longitude"]):
+                coords = None
+
+            # The lookups are independent, so run them together
+            fetches = {
+                "position":
+                lambda: get_iss_position(units="kilometers", timestamps=True)
+            }
+            if coords:
+                fetches["overhead"] = lambda: cached_iss_overhead(
+                    coords["latitude"], coords["longitude"])
+                fetches["coord_info"] = lambda: cached_coordinates_info(
+                    coords["latitude"], coords["longitude"])
+            # TLE data for orbital calculations
+            if "orbital" in query_lower or "tle" in query_lower:
+                fetches["tle"] = get_iss_tle
+            # Satellite list
+            if "satellite" in query_lower:
+                fetches["satellites"] = lambda: cached_feed(
+                    "satellites", satellites)
+            fetched = dict(zip(fetches, fetch_parallel(*fetches.values())))
 
-        if any(word in query_lower for word in
-               ["iss", "station", "space station", "international", "orbit"]):
             # Current position
-            position = get_iss_position(units="kilometers", timestamps=True)
+            position = fetched["position"]
             if position:
                 result_item = {
                     "type": "current_position",
@@ -769,43 +1374,30 @@ def search_iss_enhanced(query: str, parsed_query: Dict[str, Any],
                 }
 
                 # Check if overhead at specific coordinates
-                spatial = parsed_query.get("spatial", {})
-                if "coordinates" in spatial:
-                    coords = spatial["coordinates"]
-                    overhead = is_iss_overhead(coords["latitude"],
-                                               coords["longitude"])
-                    coord_info = get_coordinates_info(coords["latitude"],
-                                                      coords["longitude"])
-
+                if coords:
                     result_item["overhead_check"] = {
-                        "is_overhead": overhead,
+                        "is_overhead": fetched["overhead"],
                         "coordinates": coords,
-                        "location_info": coord_info
+                        "location_info": fetched["coord_info"]
                     }
 
                 results.append(result_item)
 
-            # TLE data for orbital calculations
-            if "orbital" in query_lower or "tle" in query_lower:
-                tle_data = get_iss_tle()
-                if tle_data:
-                    results.append({
-                        "type": "tle_data",
-                        "source": "ISS TLE Data",
-                        "data": tle_data,
-                        "relevance_score": 0.8
-                    })
+            if fetched.get("tle"):
+                results.append({
+                    "type": "tle_data",
+                    "source": "ISS TLE Data",
+                    "data": fetched["tle"],
+                    "relevance_score": 0.8
+                })
 
-            # Satellite list
-            if "satellite" in query_lower:
-                sats = satellites()
-                if sats:
-                    results.append({
-                        "type": "satellites",
-                        "source": "Tracked Satellites",
-                        "data": sats,
-                        "relevance_score": 0.6
-                    })
+            if fetched.get("satellites"):
+                results.append({
+                    "type": "satellites",
+                    "source": "Tracked Satellites",
+                    "data": fetched["satellites"],
+                    "relevance_score": 0.6
+                })
 
         if results:
             return {
@@ -815,8 +1407,8 @@ def search_iss_enhanced(query: str, parsed_query: Dict[str, Any],
                 "query_interpretation": parsed_query
             }
 
-    except Exception as e:
-        print(f"Error in enhanced ISS search: {e}")
+    except Exception:
+        logger.exception("Error in enhanced ISS search")
 
     return None
 
@@ -885,8 +1477,8 @@ def find_cross_dataset_correlations(
                         "Different telescopes excel at finding different types of planets"
                     })
 
-    except Exception as e:
-        print(f"Error finding correlations: {e}")
+    except Exception:
+        logger.exception("Error finding correlations")
 
     return correlations
 
@@ -925,12 +1517,13 @@ def generate_intelligent_suggestions(
         ])
 
     # Entity-based suggestions
-    if "mars" in entities.get("celestial_bodies", []):
+    spacecraft = entities.get("spacecraft", ())
+    if "mars" in entities.get("celestial_bodies", ()):
         suggestions.append(
             "Mars atmospheric dust storm patterns and rover impact")
-    if "iss" in entities.get("spacecraft", []):
+    if "iss" in spacecraft:
         suggestions.append("ISS experimental modules and research activities")
-    if "curiosity" in entities.get("spacecraft", []):
+    if "curiosity" in spacecraft:
         suggestions.append(
             "Curiosity rover geological discoveries and sample analysis")
 
@@ -941,10 +1534,14 @@ def generate_intelligent_suggestions(
         "Potentially habitable exoplanets with confirmed water vapor"
     ]
 
-    # Combine and limit suggestions
-    all_suggestions = suggestions + trending
-    return list(
-        dict.fromkeys(all_suggestions))[:5]  # Remove duplicates and limit
+    # Combine and remove duplicates, stopping as soon as there are five
+    unique = []
+    for suggestion in chain(suggestions, trending):
+        if suggestion not in unique:
+            unique.append(suggestion)
+            if len(unique) == 5:
+                break
+    return unique
 
 
 # ==============================================================================
@@ -952,35 +1549,51 @@ def generate_intelligent_suggestions(
 # ==============================================================================
 
 
+_ROOT_INFO = {
+    "message":
+    "NASA Space Data Hub API v2.0 - Enhanced with NLP",
+    "status":
+    "running",
+    "endpoints": {
+        "exoplanets": "/api/exoplanets/",
+        "iss": "/api/iss/",
+        "mars": "/api/mars/",
+        "search": "/api/search/",
+        "docs": "/docs",
+        "health": "/health"
+    },
+    "features": [
+        "Natural Language Processing", "Intelligent Query Interpretation",
+        "Cross-Dataset Correlations", "Fuzzy Name Matching",
+        "Comprehensive Search Results"
+    ]
+}
+
+
 @app.get("/")
 def read_root():
-    try:
-        return {
-            "message":
-            "NASA Space Data Hub API v2.0 - Enhanced with NLP",
-            "status":
-            "running",
-            "endpoints": {
-                "exoplanets": "/api/exoplanets/",
-                "iss": "/api/iss/",
-                "mars": "/api/mars/",
-                "search": "/api/search/",
-                "docs": "/docs",
-                "health": "/health"
-            },
-            "features": [
-                "Natural Language Processing",
-                "Intelligent Query Interpretation",
-                "Cross-Dataset Correlations", "Fuzzy Name Matching",
-                "Comprehensive Search Results"
-            ]
-        }
-    except Exception as e:
-        logger.error(f"Error in root endpoint: {e}")
-        return {"error": "Server error", "details": str(e)}
+    return _ROOT_INFO
 
 
 # EXOPLANETS ENDPOINTS
+MAX_CLAUSE_LENGTH = 512
+_FORBIDDEN_SQL = (";", "--", "/*")
+
+
+def _validate_clause(name: str, clause: Optional[str]) -> None:
+    """Reject oversized or multi-statement clauses before going upstream"""
+    if not clause:
+        return
+    if len(clause) > MAX_CLAUSE_LENGTH:
+        logger.warning("Rejected exoplanet query: %s too long (%d chars)",
+                       name, len(clause))
+        raise HTTPException(status_code=400, detail=f"{name} too long")
+    if any(token in clause for token in _FORBIDDEN_SQL):
+        logger.warning("Rejected exoplanet query: %s=%r", name, clause)
+        raise HTTPException(status_code=400,
+                            detail=f"{name} contains forbidden characters")
+
+
 @app.get("/api/exoplanets/")
 def get_exoplanets(
         table: str = Query(...,
@@ -989,16 +1602,16 @@ def get_exoplanets(
         select: Optional[str] = Query("*", description="Columns to select"),
         where: Optional[str] = Query(None, description="Filter conditions"),
         order: Optional[str] = Query(None, description="Order by clause"),
-        format: Optional[str] = Query("json",
-                                      description="Output format",
-                                      enum=["json", "csv", "xml"])):
+        format: ExoFormatT = Query("json", description="Output format")):
     """Get exoplanet data from NASA Exoplanet Archive"""
+    _validate_clause("where", where)
+    _validate_clause("order", order)
     try:
-        result = get_exoplanet(table=table,
-                               select=select,
-                               where=where,
-                               order=order,
-                               format=format)
+        result = fetch_exoplanets(table=table,
+                                  select=select,
+                                  where=where,
+                                  order=order,
+                                  format=format)
         if result is None:
             raise HTTPException(status_code=404, detail="No data found")
         return {"data": result, "table": table, "format": format}
@@ -1007,10 +1620,22 @@ def get_exoplanets(
                             detail=f"Error fetching exoplanet data: {str(e)}")
 
 
+_TABLES_INFO = {"tables": db_tables}
+_TABLES_ETAG = '"%s"' % hashlib.blake2b(json.dumps(db_tables).encode(),
+                                        digest_size=8).hexdigest()
+_TABLES_HEADERS = {
+    "ETag": _TABLES_ETAG,
+    "Cache-Control": "public, max-age=86400"
+}
+
+
 @app.get("/api/exoplanets/tables")
-def get_available_tables():
+def get_available_tables(request: Request, response: Response):
     """Get list of available exoplanet database tables"""
-    return {"tables": db_tables}
+    if request.headers.get("if-none-match") == _TABLES_ETAG:
+        return Response(status_code=304, headers=_TABLES_HEADERS)
+    response.headers.update(_TABLES_HEADERS)
+    return _TABLES_INFO
 
 
 @app.get("/api/exoplanets/search")
@@ -1041,7 +1666,7 @@ def search_exoplanets(discovery_year: Optional[int] = Query(
         where_clause = " and ".join(
             where_conditions) if where_conditions else None
 
-        result = get_exoplanet(
+        result = fetch_exoplanets(
             table="ps",
             select="pl_name,pl_rade,disc_year,st_teff,sy_dist,pl_orbsmax",
             where=where_clause,
@@ -1060,16 +1685,17 @@ def search_exoplanets(discovery_year: Optional[int] = Query(
 
 # ISS ENDPOINTS
 @app.get("/api/iss/")
-def get_iss_current_position(units: Optional[str] = Query(
-    "kilometers",
-    description="Units for measurements",
-    enum=["kilometers", "miles"]),
+def get_iss_current_position(units: UnitsT = Query(
+    "kilometers", description="Units for measurements"),
                              timestamps: Optional[bool] = Query(
                                  False,
                                  description="Include timestamp information")):
     """Get current ISS position and orbital data"""
     try:
-        position = get_iss_position(units=units, timestamps=timestamps)
+        position = single_flight(_qhash("iss_position", units, timestamps),
+                                 get_iss_position,
+                                 units=units,
+                                 timestamps=timestamps)
         if position is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch ISS position")
@@ -1080,13 +1706,14 @@ def get_iss_current_position(units: Optional[str] = Query(
 
 
 @app.get("/api/iss/tle")
-def get_iss_tle_data():
+def get_iss_tle_data(response: Response):
     """Get ISS Two-Line Element (TLE) orbital data"""
     try:
         tle_data = get_iss_tle()
         if tle_data is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch ISS TLE data")
+        response.headers["Cache-Control"] = "public, max-age=60"
         return tle_data
     except Exception as e:
         raise HTTPException(status_code=500,
@@ -1097,7 +1724,7 @@ def get_iss_tle_data():
 def get_tracked_satellites():
     """Get list of all tracked satellites"""
     try:
-        sats = satellites()
+        sats = cached_feed("satellites", satellites)
         return {"satellites": sats}
     except Exception as e:
         raise HTTPException(status_code=500,
@@ -1106,24 +1733,26 @@ def get_tracked_satellites():
 
 @app.get("/api/iss/overhead/{latitude}/{longitude}")
 def check_iss_overhead(
-    latitude: float,
-    longitude: float,
+    latitude: float = Path(..., ge=-90, le=90),
+    longitude: float = Path(..., ge=-180, le=180),
     altitude_threshold: Optional[float] = Query(
         500, description="Minimum altitude in km to consider overhead")):
     """Check if ISS is currently overhead at given coordinates"""
     try:
-        overhead = is_iss_overhead(latitude, longitude, altitude_threshold)
-        coords_info = get_coordinates_info(latitude, longitude)
-
-        return {
-            "is_overhead": overhead,
-            "coordinates": {
-                "latitude": latitude,
-                "longitude": longitude
-            },
-            "altitude_threshold_km": altitude_threshold,
-            "location_info": coords_info
-        }
+        overhead = cached_iss_overhead(latitude, longitude,
+                                       altitude_threshold)
+        coords_info = cached_coordinates_info(latitude, longitude)
+
+        # Returned as a response so the encoder serializes the dataclass
+        # itself; FastAPI would otherwise copy it through asdict first
+        return DefaultResponse(
+            IssOverheadResponse(is_overhead=overhead,
+                                coordinates={
+                                    "latitude": latitude,
+                                    "longitude": longitude
+                                },
+                                altitude_threshold_km=altitude_threshold,
+                                location_info=coords_info))
     except Exception as e:
         raise HTTPException(status_code=500,
                             detail=f"Error checking ISS overhead: {str(e)}")
@@ -1132,6 +1761,7 @@ def check_iss_overhead(
 # MARS ENDPOINTS
 @app.get("/api/mars/apod")
 def get_astronomy_picture_of_day(
+        response: Response,
         date: Optional[str] = Query(None,
                                     description="Date in YYYY-MM-DD format"),
         start_date: Optional[str] = Query(None,
@@ -1157,14 +1787,17 @@ def get_astronomy_picture_of_day(
                 status_code=400,
                 detail="Cannot specify 'count' with date range parameters")
 
-        result = apod(date=date,
-                      start_date=start_date,
-                      end_date=end_date,
-                      count=count,
-                      thumbs=thumbs)
+        result = _mars().apod(date=date,
+                              start_date=start_date,
+                              end_date=end_date,
+                              count=count,
+                              thumbs=thumbs)
         if result is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch APOD data")
+        if date:
+            # A picture for a fixed date never changes
+            response.headers["Cache-Control"] = "public, max-age=3600"
         return result
     except HTTPException:
         raise
@@ -1176,15 +1809,17 @@ def get_astronomy_picture_of_day(
 @app.get("/api/mars/rover/{rover_name}/photos")
 def get_rover_photos(
     rover_name: str,
-    sol: Optional[int] = Query(None, description="Martian sol (day)"),
+    sol: Optional[int] = Query(None,
+                               ge=0,
+                               le=MAX_SOL,
+                               description="Martian sol (day)"),
     earth_date: Optional[str] = Query(None,
                                       description="Earth date (YYYY-MM-DD)"),
     camera: Optional[str] = Query(None, description="Camera name"),
     page: Optional[int] = Query(1, description="Page number")):
     """Get Mars rover photos by sol or Earth date"""
     try:
-        rover = CuriosityRover()
-
+        rover = _mars_client("CuriosityRover")
         if sol is not None:
             result = rover.photos_by_sol(rover_name, sol, camera, page)
         elif earth_date is not None:
@@ -1208,7 +1843,7 @@ def get_rover_photos(
 def get_rover_manifest(rover_name: str):
     """Get mission manifest for a Mars rover"""
     try:
-        rover = CuriosityRover()
+        rover = _mars_client("CuriosityRover")
         result = rover.mission_manifest(rover_name)
         if result is None:
             raise HTTPException(
@@ -1227,8 +1862,7 @@ def get_neo_feed(start_date: Optional[str] = Query(
                      None, description="End date (YYYY-MM-DD)")):
     """Get Near Earth Objects approaching Earth"""
     try:
-        neow = Neow()
-        result = neow.neo_feed(start_date, end_date)
+        result = _mars_client("Neow").neo_feed(start_date, end_date)
         if result is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch NEO data")
@@ -1242,8 +1876,7 @@ def get_neo_feed(start_date: Optional[str] = Query(
 def get_asteroid_details(asteroid_id: str):
     """Get details for a specific asteroid by NASA JPL ID"""
     try:
-        neow = Neow()
-        result = neow.neo_lookup(asteroid_id)
+        result = _mars_client("Neow").neo_lookup(asteroid_id)
         if result is None:
             raise HTTPException(status_code=404,
                                 detail=f"Asteroid {asteroid_id} not found")
@@ -1259,7 +1892,7 @@ def get_epic_natural_images(date: Optional[str] = Query(
     None, description="Date in YYYY-MM-DD format")):
     """Get EPIC natural color Earth images"""
     try:
-        epic = Epic()
+        epic = _mars_client("Epic")
         if date:
             result = epic.natural_by_date(date)
         else:
@@ -1277,8 +1910,7 @@ def get_epic_natural_images(date: Optional[str] = Query(
 def get_coronal_mass_ejections():
     """Get Coronal Mass Ejection data"""
     try:
-        donki = Donki()
-        result = donki.cme()
+        result = cached_feed("donki_cme", _mars_client("Donki").cme)
         if result is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch CME data")
@@ -1292,8 +1924,7 @@ def get_coronal_mass_ejections():
 def get_solar_flares():
     """Get Solar Flare data"""
     try:
-        donki = Donki()
-        result = donki.flr()
+        result = cached_feed("donki_flr", _mars_client("Donki").flr)
         if result is None:
             raise HTTPException(status_code=503,
                                 detail="Unable to fetch solar flare data")
@@ -1306,14 +1937,14 @@ def get_solar_flares():
 
 @app.get("/api/mars/natural-events")
 def get_natural_events(
-        status: Optional[str] = Query("open", description="Event status"),
+        status: EventStatusT = Query("open", description="Event status"),
         limit: Optional[int] = Query(10,
                                      description="Number of events to return"),
         days: Optional[int] = Query(None,
                                     description="Events from last N days")):
     """Get Earth natural events from EONET"""
     try:
-        eonet = Eonet()
+        eonet = _mars_client("Eonet")
         result = eonet.events(status=status, limit=limit, days=days)
         if result is None:
             raise HTTPException(status_code=503,
@@ -1333,7 +1964,7 @@ def search_nasa_images(
         year_end: Optional[int] = Query(None, description="End year")):
     """Search NASA Image and Video Library"""
     try:
-        nasa_images = NasaImages()
+        nasa_images = _mars_client("NasaImages")
         result = nasa_images.search(q, media_type, year_start, year_end)
         if result is None:
             raise HTTPException(status_code=404, detail="No images found")
@@ -1343,6 +1974,99 @@ def search_nasa_images(
                             detail=f"Error searching NASA images: {str(e)}")
 
 
+# SEARCH ENDPOINTS
+SEARCH_DATASETS = ("exoplanets", "mars", "iss")
+SEARCH_CACHE_TTL = 30  # results include live ISS data
+
+
+@app.get("/api/search/")
+async def unified_search(
+        q: str = Query(...,
+                       min_length=1,
+                       max_length=500,
+                       description="Natural language search query"),
+        datasets: str = Query(
+            "exoplanets,mars,iss",
+            description="Comma-separated datasets to search"),
+        limit: int = Query(20,
+                           ge=1,
+                           le=100,
+                           description="Results per dataset"),
+        min_distance: Optional[float] = Query(
+            None, description="Minimum system distance"),
+        max_distance: Optional[float] = Query(
+            None, description="Maximum system distance"),
+        min_mass: Optional[float] = Query(
+            None, description="Minimum planet mass (Earth masses)"),
+        max_mass: Optional[float] = Query(
+            None, description="Maximum planet mass (Earth masses)")):
+    """Search all datasets with a natural language query"""
+    start = time.perf_counter()
+    requested = {part.strip().lower() for part in datasets.split(",")}
+    selected = [name for name in SEARCH_DATASETS if name in requested]
+    if not selected:
+        raise HTTPException(status_code=400,
+                            detail="datasets must include one of "
+                            f"{', '.join(SEARCH_DATASETS)}")
+
+    advanced_filters = {
+        key: value
+        for key, value in (("min_distance", min_distance),
+                           ("max_distance", max_distance),
+                           ("min_mass", min_mass), ("max_mass", max_mass))
+        if value is not None
+    }
+
+    # Every parameter that shapes the response is part of the key
+    cache_key = _qhash("search", q, selected, limit,
+                       sorted(advanced_filters.items()))
+    cached = get_cached_results(cache_key)
+    if cached is not None:
+        return DefaultResponse({
+            **cached, "response_time_ms":
+            round((time.perf_counter() - start) * 1000, 2)
+        })
+
+    parsed_query = nlp_processor.parse_query(q)
+
+    # The backends are independent, so query them concurrently in the
+    # threadpool; total latency is the slowest source rather than the sum
+    searches = {
+        "exoplanets": (search_exoplanets_advanced, q, parsed_query, limit,
+                       advanced_filters),
+        "mars": (search_mars_comprehensive, q, parsed_query, limit),
+        "iss": (search_iss_enhanced, q, parsed_query, limit)
+    }
+    outcomes = await asyncio.gather(
+        *(asyncio.to_thread(*searches[name]) for name in selected),
+        return_exceptions=True)
+
+    results = {}
+    for name, outcome in zip(selected, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Search of %s failed", name, exc_info=outcome)
+        elif outcome:
+            results[name] = outcome
+
+    response = {
+        "query": q,
+        "parsed_query": parsed_query,
+        "results": results,
+        "total_results": sum(r.get("count", 0) for r in results.values()),
+        "correlations": find_cross_dataset_correlations(results),
+        "suggestions": generate_intelligent_suggestions(q, parsed_query)
+    }
+    if results:
+        cache_results(cache_key, response, SEARCH_CACHE_TTL)
+
+    # The payload is plain JSON data, so hand it straight to the encoder
+    # instead of walking it with jsonable_encoder first
+    return DefaultResponse({
+        **response, "response_time_ms":
+        round((time.perf_counter() - start) * 1000, 2)
+    })
+
+
 # ----------------------------------------------
 
 if __name__ == "__main__":
@@ -0,0 +1,101 @@
+import logging
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Settle the path of import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from server import server
+
+EXOPLANETS = {
+    "source": "NASA Exoplanet Archive",
+    "count": 2,
+    "data": [{"pl_name": "Kepler-22 b"}, {"pl_name": "TRAPPIST-1 e"}]
+}
+MARS = {
+    "source": "NASA Mars & Space APIs",
+    "count": 1,
+    "data": [{"type": "apod", "relevance_score": 0.8}]
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with an empty response cache and canned searches"""
+    monkeypatch.setattr(server, "_response_cache", {})
+    monkeypatch.setattr(server, "_cache_weight", 0)
+
+    calls = []
+
+    def fake(name, result):
+
+        def search(query, parsed_query, limit, *args):
+            calls.append(name)
+            return result
+
+        return search
+
+    monkeypatch.setattr(server, "search_exoplanets_advanced",
+                        fake("exoplanets", EXOPLANETS))
+    monkeypatch.setattr(server, "search_mars_comprehensive",
+                        fake("mars", MARS))
+    monkeypatch.setattr(server, "search_iss_enhanced", fake("iss", None))
+
+    test_client = TestClient(server.app)
+    test_client.calls = calls
+    return test_client
+
+
+def test_search_merges_sources_and_caches(client):
+    """Results from every selected source are merged, then cached"""
+    response = client.get("/api/search/",
+                          params={"q": "earth-like planets since 2020"})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["query"] == "earth-like planets since 2020"
+    assert body["parsed_query"]["temporal"]["since_year"] == 2020
+    assert set(body["results"]) == {"exoplanets", "mars"}
+    assert body["total_results"] == 3
+    assert "response_time_ms" in body
+    assert sorted(client.calls) == ["exoplanets", "iss", "mars"]
+
+    # The same query is answered from the cache without searching again
+    again = client.get("/api/search/",
+                       params={"q": "earth-like planets since 2020"})
+    assert again.json()["results"] == body["results"]
+    assert len(client.calls) == 3
+
+
+def test_search_skips_failing_source(client, monkeypatch, caplog):
+    """A source that raises is logged with its traceback and left out"""
+
+    def broken(query, parsed_query, limit):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(server, "search_mars_comprehensive", broken)
+
+    with caplog.at_level(logging.ERROR, logger=server.logger.name):
+        response = client.get("/api/search/",
+                              params={
+                                  "q": "mars photos",
+                                  "datasets": "exoplanets,mars"
+                              })
+
+    assert response.status_code == 200
+    assert set(response.json()["results"]) == {"exoplanets"}
+
+    failures = [r for r in caplog.records if "Search of mars" in r.message]
+    assert failures and failures[0].exc_info[0] is RuntimeError
+
+
+def test_search_rejects_unknown_datasets(client):
+    """Only known datasets can be searched"""
+    response = client.get("/api/search/",
+                          params={
+                              "q": "planets",
+                              "datasets": "asteroids"
+                          })
+    assert response.status_code == 400